@@ -1,74 +1,145 @@
 import streamlit as st
 import yfinance as yf
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 import math
 import plotly.graph_objects as go
 from scipy.stats import norm
 import numpy as np
+from numba import njit
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+# Option chain columns the PUT scoring relies on
+REQUIRED_PUT_COLUMNS = {'strike', 'bid', 'lastPrice', 'impliedVolatility'}
 
 # --- Helper Functions ---
 
-def calculate_delta(S, K, T, r, sigma, option_type='put'):
+def _script_thread_pool(max_workers):
     """
-    Calculates the Delta of an option using the Black-Scholes model.
-    S: Current Stock Price
-    K: Strike Price
-    T: Time to Expiration (in years)
-    r: Risk-Free Rate
-    sigma: Implied Volatility
-    option_type: 'call' or 'put'
+    Returns a ThreadPoolExecutor whose workers carry the calling script's ScriptRunContext,
+    so st.cache_data functions called from them don't warn about a missing context.
+    Workers must still not touch Streamlit widgets.
     """
-    try:
-        if T <= 0 or sigma <= 0:
-            return 0
-            
+    ctx = get_script_run_ctx()
+    return ThreadPoolExecutor(max_workers=max_workers, initializer=add_script_run_ctx, initargs=(None, ctx))
+
+def calculate_put_deltas(S, K, T, r, sigma):
+    """
+    Vectorized Black-Scholes Delta for an array of PUT strikes.
+    K and sigma are NumPy arrays; contracts without a usable IV get a Delta of 0.
+    """
+    if T <= 0:
+        return np.zeros(len(K))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
         d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        
-        if option_type == 'call':
-            delta = norm.cdf(d1)
-        else:
-            delta = norm.cdf(d1) - 1
-            
-        return delta
-    except Exception:
-        return 0
+        delta = norm.cdf(d1) - 1
+
+    return np.where((sigma > 0) & np.isfinite(delta), delta, 0.0)
 
-def get_live_data(ticker_symbol):
+@st.cache_data(ttl=60, show_spinner=False)
+def get_put_chain(ticker_symbol, exp_date_str, _stock):
     """
-    Fetches live data and option chains for a given ticker symbol.
+    Fetches the PUT side of the option chain for a single expiration date.
+    _stock is the caller's yf.Ticker (left out of the cache key); it should already
+    have its expiration list loaded so each chain costs a single request.
+    """
+    return _stock.option_chain(exp_date_str).puts
+
+@njit(cache=True, fastmath=True)
+def _score_puts(strikes, bids, lasts, current_price, capital, days_to_exp, desired_roi):
+    """
+    Scores a PUT chain in a single pass over raw arrays.
+    Returns (mask, premium, monthly_roi, annual_roi); only rows where mask is True are valid.
+    """
+    n = strikes.shape[0]
+    mask = np.zeros(n, dtype=np.bool_)
+    premium = np.zeros(n)
+    monthly_roi = np.zeros(n)
+    annual_roi = np.zeros(n)
+
+    # Per-expiration invariants, hoisted so the loop body is division-free apart from p / strike
+    monthly_factor = 30.0 / days_to_exp * 100
+    annual_factor = 365.0 / days_to_exp * 100
+
+    for i in range(n):
+        strike = strikes[i]
+
+        # Filter Puts
+        # 1. Strike < Current Price (OTM Puts usually preferred for Wheel to acquire at discount)
+        # 2. Strike * 100 <= Capital (Cash Secured)
+        if not (0 < strike < current_price and strike * 100 <= capital):
+            continue
+
+        # Estimate premium (midpoint or last if bid/ask wide/missing)
+        p = bids[i] if bids[i] > 0 else lasts[i]
+        if not p > 0:
+            continue
+
+        # ROI Calculation
+        # Strategy: Cash Secured Put. Risk is Strike * 100. Reward is Premium * 100.
+        trade_roi = p / strike
+
+        # Normalize to 'Monthly' ROI roughly for user filter
+        m_roi = trade_roi * monthly_factor
+
+        premium[i] = p
+        monthly_roi[i] = m_roi
+        # Annualized ROI for comparison
+        annual_roi[i] = trade_roi * annual_factor
+        mask[i] = m_roi >= desired_roi
+
+    return mask, premium, monthly_roi, annual_roi
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _fetch_live_data(ticker_symbol, _stock):
+    """
+    Fetches the current price, expiration dates and next earnings date for a ticker.
+    _stock is the run's yf.Ticker for ticker_symbol and is left out of the cache key.
+    Raises on failure; st.cache_data doesn't store exceptions, so errors are retried on the next run.
     """
+    stock = _stock
+    # Fast info is often quicker/more reliable than .info for real-time price
+    current_price = stock.fast_info.last_price
+    
+    # Get next earning date
+    next_earnings = "N/A"
     try:
-        stock = yf.Ticker(ticker_symbol)
-        # Fast info is often quicker/more reliable than .info for real-time price
-        current_price = stock.fast_info.last_price
+        cal = stock.calendar
+        # stock.calendar is usually a dict where 'Earnings Date' is a list of date objects or a single date
+        if cal and 'Earnings Date' in cal:
+            dates = cal['Earnings Date']
+            if dates:
+                # Handle if it's a list or single value
+                date_val = dates[0] if isinstance(dates, list) else dates
+                next_earnings = date_val.strftime('%Y-%m-%d')
+    except Exception:
+        pass
+
+    # Get expiration dates
+    expirations = stock.options
+    if not expirations:
+        raise ValueError("No options data found.")
         
-        # Get next earning date
-        next_earnings = "N/A"
-        try:
-            cal = stock.calendar
-            # stock.calendar is usually a dict where 'Earnings Date' is a list of date objects or a single date
-            if cal and 'Earnings Date' in cal:
-                dates = cal['Earnings Date']
-                if dates:
-                    # Handle if it's a list or single value
-                    date_val = dates[0] if isinstance(dates, list) else dates
-                    next_earnings = date_val.strftime('%Y-%m-%d')
-        except Exception:
-            pass
+    return current_price, expirations, next_earnings
 
-        # Get expiration dates
-        expirations = stock.options
-        if not expirations:
-            return None, [], None, "No options data found."
-            
-        return current_price, expirations, next_earnings, None
+def get_live_data(ticker_symbol, stock):
+    """
+    Fetches live data and option chains for a given ticker symbol.
+    Returns (current_price, expirations, next_earnings, error).
+    """
+    try:
+        current_price, expirations, next_earnings = _fetch_live_data(ticker_symbol, stock)
     except Exception as e:
         return None, [], None, str(e)
 
-def analyze_puts(ticker_symbol, current_price, expirations, capital, desired_roi, target_weeks, next_earnings="N/A"):
+    return current_price, expirations, next_earnings, None
+
+def analyze_puts(ticker_symbol, stock, current_price, expirations, capital, desired_roi, target_weeks, next_earnings="N/A"):
     """
     Analyzes PUT options for the Wheel Strategy.
+    Returns a DataFrame with one row per suggested contract (empty if none match).
     """
     suggestions = []
     today = datetime.now()
@@ -76,117 +147,205 @@ def analyze_puts(ticker_symbol, current_price, expirations, capital, desired_roi
     
     # We'll limit the number of expiration dates to check to keep it fast
     # Filter expirations based on target_weeks
-    valid_expirations = []
     
     # Calculate target window (e.g. +/- 4 days from the target week count)
     target_days = target_weeks * 7
     min_days = max(1, target_days - 4)
     max_days = target_days + 4
     
-    for exp_date_str in expirations:
-        try:
-            exp_date = datetime.strptime(exp_date_str, '%Y-%m-%d')
-            days_to_exp = (exp_date - today).days
-            if min_days <= days_to_exp <= max_days:
-                valid_expirations.append(exp_date_str)
-        except:
-            continue
+    # Parse all expiration dates in one pass; unparseable dates become NaT and drop out of the mask
+    exp_strs = pd.Series(list(expirations), dtype=object)
+    exp_dates = pd.to_datetime(exp_strs, format='%Y-%m-%d', errors='coerce')
+    days = (exp_dates - pd.Timestamp(today)).dt.days
+    in_window = (days >= min_days) & (days <= max_days)
+
+    valid_expirations = exp_strs[in_window].tolist()
+    days_by_exp = dict(zip(valid_expirations, days[in_window].astype(int).tolist()))
             
-    stock = yf.Ticker(ticker_symbol)
+    if not valid_expirations:
+        return pd.DataFrame()
+
+    # Load the expiration list up front (a no-op if get_live_data already did) so
+    # option_chain() doesn't refetch it inside each worker
+    stock.options
 
-    for exp_date_str in valid_expirations:
+    def fetch_chain(exp_date_str):
+        # Only the network call runs in the pool; filtering stays sequential below
         try:
-            # Fetch option chain for specific date
-            opt_chain = stock.option_chain(exp_date_str)
-            puts = opt_chain.puts
-            
-            exp_date = datetime.strptime(exp_date_str, '%Y-%m-%d')
-            days_to_exp = (exp_date - today).days
-            if days_to_exp <= 0: days_to_exp = 1 # avoid div by zero
-            T_years = days_to_exp / 365.0
-
-            # Filter Puts
-            # 1. Strike < Current Price (OTM Puts usually preferred for Wheel to acquire at discount)
-            # 2. Strike * 100 <= Capital (Cash Secured)
-            
-            candidate_puts = puts[
-                (puts['strike'] < current_price) & 
-                (puts['strike'] * 100 <= capital)
-            ]
-            
-            for index, row in candidate_puts.iterrows():
-                strike = row['strike']
-                last_price = row['lastPrice']
-                bid = row['bid']
-                ask = row['ask']
-                implied_volatility = row['impliedVolatility']
-                
-                # Estimate premium (midpoint or last if bid/ask wide/missing)
-                premium = bid if bid > 0 else last_price
-                if premium <= 0: continue
-                
-                # ROI Calculation
-                # Strategy: Cash Secured Put. Risk is Strike * 100. Reward is Premium * 100.
-                capital_required = strike * 100
-                total_premium = premium * 100
-                
-                # Estimate Delta if not available
-                # Use Risk Free Rate approx 4.5% (0.045)
-                delta_val = calculate_delta(current_price, strike, T_years, 0.045, implied_volatility, 'put')
-                delta_val = round(delta_val, 3)
-
-                # ROI for this specific trade duration
-                trade_roi = (total_premium / capital_required) * 100
-                
-                # Annualized ROI for comparison
-                annualized_roi = trade_roi * (365 / days_to_exp)
-                
-                # Normalize to 'Monthly' ROI roughly for user filter
-                monthly_roi_est = trade_roi * (30 / days_to_exp)
-                
-                if monthly_roi_est >= desired_roi:
-                    suggestions.append({
-                        "Symbol": ticker_symbol,
-                        "Type": "PUT",
-                        "Strike": strike,
-                        "Expiration": exp_date_str,
-                        "Premium": premium,
-                        "Cost Basis": strike - premium,
-                        "Monthly ROI (%)": round(monthly_roi_est, 2),
-                        "Annualized ROI (%)": round(annualized_roi, 2),
-                        "Delta": delta_val, # Added placeholder
-                        "Earnings": next_earnings,
-                        "Break Even": strike - premium,
-                        "Capital Req": capital_required
-                    })
-                    
-        except Exception as e:
-            # Skip if chain fetch fails
+            return get_put_chain(ticker_symbol, exp_date_str, stock)
+        except Exception:
+            return None
+
+    with _script_thread_pool(8) as executor:
+        put_chains = list(executor.map(fetch_chain, valid_expirations))
+
+    for exp_date_str, puts in zip(valid_expirations, put_chains):
+        # Skip if chain fetch failed
+        if puts is None:
             continue
 
-    return suggestions
+        # Skip if the chain data is malformed
+        if not REQUIRED_PUT_COLUMNS.issubset(puts.columns):
+            continue
+
+        days_to_exp = days_by_exp[exp_date_str]
+        T_years = days_to_exp / 365.0
+
+        # fastmath assumes no NaNs, so missing quotes are zeroed before entering the kernel
+        strikes = np.nan_to_num(puts['strike'].to_numpy(dtype=np.float64))
+        bids = np.nan_to_num(puts['bid'].to_numpy(dtype=np.float64))
+        lasts = np.nan_to_num(puts['lastPrice'].to_numpy(dtype=np.float64))
+
+        mask, premium, monthly_roi_est, annualized_roi = _score_puts(
+            strikes,
+            bids,
+            lasts,
+            float(current_price),
+            float(capital),
+            float(days_to_exp),
+            float(desired_roi)
+        )
+        if not mask.any():
+            continue
+
+        strike = strikes[mask]
+        premium = premium[mask]
+
+        # Estimate Delta if not available
+        # Use Risk Free Rate approx 4.5% (0.045)
+        delta_vals = calculate_put_deltas(
+            current_price,
+            strike,
+            T_years,
+            0.045,
+            puts['impliedVolatility'].to_numpy(dtype=np.float64)[mask]
+        )
+
+        result = pd.DataFrame({
+            "Symbol": ticker_symbol,
+            "Type": "PUT",
+            "Strike": strike,
+            "Expiration": exp_date_str,
+            "Premium": premium,
+            "Cost Basis": strike - premium,
+            "Monthly ROI (%)": np.round(monthly_roi_est[mask], 2),
+            "Annualized ROI (%)": np.round(annualized_roi[mask], 2),
+            "Delta": np.round(delta_vals, 3),
+            "Earnings": next_earnings,
+            "Break Even": strike - premium,
+            "Capital Req": strike * 100
+        })
+        suggestions.append(result)
+
+    if not suggestions:
+        return pd.DataFrame()
+    return pd.concat(suggestions, ignore_index=True)
+
+def prefetch_histories(tickers, days=30):
+    """
+    Downloads price history for several tickers in one batched request and
+    stores the per-ticker frames in st.session_state['hist_cache'].
+    The cache only holds the latest run's tickers, so it stays bounded by the watchlist.
+    """
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        return
+
+    hist_cache = {}
+    st.session_state['hist_cache'] = hist_cache
+    # Bands computed from the previous run's histories are stale now
+    st.session_state['bollinger_cache'] = {}
+    try:
+        data = yf.download(
+            tickers=" ".join(tickers),
+            period=f"{days+20}d",
+            group_by='ticker',
+            threads=True,
+            progress=False
+        )
+    except Exception:
+        # Charts fall back to per-ticker fetches on a cache miss
+        return
+
+    for ticker in tickers:
+        if isinstance(data.columns, pd.MultiIndex):
+            if ticker not in data.columns.get_level_values(0):
+                continue
+            hist = data[ticker]
+        else:
+            hist = data
+        hist = hist.dropna(how='all')
+        if len(hist) > 0:
+            hist_cache[(ticker, days)] = hist
 
 def get_stock_history_with_bollinger(ticker, days=30):
+    # Row-selection reruns reuse the bands computed earlier in this session. Entries last
+    # until the next "Find Opportunities" run, when prefetch_histories clears the cache.
+    bollinger_cache = st.session_state.setdefault('bollinger_cache', {})
+    cached = bollinger_cache.get((ticker, days))
+    if cached is not None:
+        return cached, None
+
     try:
-        stock = yf.Ticker(ticker)
-        # Fetch slightly more data to calculate moving averages properly for the start of the 30 day window
-        hist = stock.history(period=f"{days+20}d")
+        hist = st.session_state.get('hist_cache', {}).get((ticker, days))
+        if hist is None:
+            stock = yf.Ticker(ticker)
+            # Fetch slightly more data to calculate moving averages properly for the start of the 30 day window
+            hist = stock.history(period=f"{days+20}d")
         
         if len(hist) == 0:
             return None, "No historical data found"
             
         # Bollinger Bands Calculation (20-day SMA, 2 std dev)
-        hist['SMA_20'] = hist['Close'].rolling(window=20).mean()
-        hist['Std_Dev'] = hist['Close'].rolling(window=20).std()
-        hist['Upper_Band'] = hist['SMA_20'] + (hist['Std_Dev'] * 2)
-        hist['Lower_Band'] = hist['SMA_20'] - (hist['Std_Dev'] * 2)
+        roll = hist['Close'].rolling(window=20)
+        sma = roll.mean()
+        std = roll.std()
+        hist = hist.assign(
+            SMA_20=sma,
+            Std_Dev=std,
+            Upper_Band=sma + (std * 2),
+            Lower_Band=sma - (std * 2)
+        )
         
         # Slice to requested days
         hist = hist.tail(days)
+        bollinger_cache[(ticker, days)] = hist
         return hist, None
     except Exception as e:
         return None, str(e)
 
+def process_ticker(ticker, capital, desired_roi, target_weeks):
+    """
+    Fetches and analyzes a single ticker. Runs in a worker thread, so it
+    must not touch Streamlit widgets; messages are returned instead.
+    """
+    ticker_warnings = []
+    # One Ticker per symbol per run, shared by the live data and chain fetches. It is not
+    # kept across runs because yfinance memoizes price and expirations on the instance.
+    stock = yf.Ticker(ticker)
+    current_price, expirations, next_earnings, error = get_live_data(ticker, stock)
+
+    if error:
+        ticker_warnings.append(f"Could not fetch data for {ticker}: {error}")
+        return pd.DataFrame(), ticker_warnings
+
+    if not expirations:
+        ticker_warnings.append(f"No options found for {ticker}")
+        return pd.DataFrame(), ticker_warnings
+
+    # Run Analysis
+    ticker_suggestions = analyze_puts(
+        ticker, 
+        stock, 
+        current_price, 
+        expirations, 
+        capital, 
+        desired_roi, 
+        target_weeks,
+        next_earnings
+    )
+    return ticker_suggestions, ticker_warnings
+
 # --- Streamlit App ---
 
 st.set_page_config(page_title="Passive Income - Wheel Strategy", page_icon="💰", layout="wide")
@@ -221,127 +380,151 @@ with st.expander("Strategy Parameters", expanded=True):
 
     run_btn = st.button("Find Opportunities")
 
+# The inputs results are computed from, used to flag results left over from older inputs
+current_params = (tuple(tickers), capital_input, roi_target, target_weeks)
+
 if run_btn:
     if not tickers:
         st.error("Please enter at least one ticker symbol.")
+        st.session_state.results_df = None
     else:
         all_suggestions = []
+        warnings = []
+        errors = []
         progress_bar = st.progress(0)
         status_text = st.empty()
         
-        for i, ticker in enumerate(tickers):
-            status_text.text(f"Analyzing {ticker}...")
-            
-            try:
-                current_price, expirations, next_earnings, error = get_live_data(ticker)
-                
-                if error:
-                    st.warning(f"Could not fetch data for {ticker}: {error}")
-                    continue
-                
-                if not expirations:
-                     st.warning(f"No options found for {ticker}")
-                     continue
-
-                # Run Analysis
-                ticker_suggestions = analyze_puts(
-                    ticker, 
-                    current_price, 
-                    expirations, 
-                    capital_input, 
-                    roi_target, 
-                    target_weeks,
-                    next_earnings
-                )
-                all_suggestions.extend(ticker_suggestions)
-                
-            except Exception as e:
-                st.error(f"Error processing {ticker}: {e}")
-            
-            # Update progress
-            progress_bar.progress((i + 1) / len(tickers))
+        status_text.text(f"Analyzing {len(tickers)} tickers...")
+
+        # Fetching is network-bound, so fan the tickers out over a thread pool
+        with _script_thread_pool(min(16, len(tickers))) as executor:
+            futures = {
+                executor.submit(process_ticker, ticker, capital_input, roi_target, target_weeks): ticker
+                for ticker in tickers
+            }
+
+            for i, future in enumerate(as_completed(futures)):
+                ticker = futures[future]
+                try:
+                    ticker_suggestions, ticker_warnings = future.result()
+                    if not ticker_suggestions.empty:
+                        all_suggestions.append(ticker_suggestions)
+                    warnings.extend(ticker_warnings)
+                except Exception as e:
+                    errors.append(f"Error processing {ticker}: {e}")
+
+                # Update progress
+                status_text.text(f"Analyzed {ticker}...")
+                progress_bar.progress((i + 1) / len(tickers))
+
+        for message in warnings:
+            st.warning(message)
+        for message in errors:
+            st.error(message)
         
         status_text.text("Analysis Complete!")
         
-        # Display Results
+        # Keep the results across reruns so row selection can render the detail view
         if all_suggestions:
-            df = pd.DataFrame(all_suggestions)
-            
-            # Formatting
-            st.subheader(f"Found {len(df)} Opportunities")
-            
+            df = pd.concat(all_suggestions, ignore_index=True)
+
             # Sort by highest Monthly ROI by default
-            df = df.sort_values(by="Monthly ROI (%)", ascending=False)
-            
-            # Interactive selection
-            st.info("Select a row in the table below to view detailed charts for that stock.")
+            st.session_state.results_df = df.sort_values(by="Monthly ROI (%)", ascending=False)
+            st.session_state.hist_prefetch_pending = True
+        else:
+            st.session_state.results_df = pd.DataFrame()
+        st.session_state.results_params = current_params
+
+# Display Results
+results_df = st.session_state.get("results_df")
+if results_df is not None:
+    if st.session_state.get("results_params") != current_params:
+        st.warning("These results were computed with different parameters. Press 'Find Opportunities' to refresh them.")
+
+    if not results_df.empty:
+        df = results_df
+        
+        # Formatting
+        st.subheader(f"Found {len(df)} Opportunities")
+        
+        # Interactive selection
+        st.info("Select a row in the table below to view detailed charts for that stock.")
+        
+        # Formatting is done client-side by column_config, so no per-cell Styler work in Python
+        event = st.dataframe(
+            df,
+            column_config={
+                "Strike": st.column_config.NumberColumn(format="$%.2f"),
+                "Premium": st.column_config.NumberColumn(format="$%.2f"),
+                "Cost Basis": st.column_config.NumberColumn(format="$%.2f"),
+                "Break Even": st.column_config.NumberColumn(format="$%.2f"),
+                # The "dollar" preset (Streamlit 1.42+) keeps thousands grouping; it shows two decimals
+                "Capital Req": st.column_config.NumberColumn(format="dollar"),
+                "Monthly ROI (%)": st.column_config.NumberColumn(format="%.2f%%"),
+                "Annualized ROI (%)": st.column_config.NumberColumn(format="%.2f%%"),
+                "Delta": st.column_config.NumberColumn(format="%.3f")
+            },
+            use_container_width=True,
+            selection_mode="single-row",
+            on_select="rerun"
+        )
+
+        # Warm the chart cache for every suggested ticker in one batched download,
+        # after the table so the results aren't held back by it
+        if st.session_state.get("hist_prefetch_pending"):
+            prefetch_histories(df["Symbol"].tolist(), days=90)
+            st.session_state.hist_prefetch_pending = False
+        
+        selected_rows = event.selection.rows
+        if selected_rows:
+            selected_index = selected_rows[0]
+            selected_record = df.iloc[selected_index]
+            sel_ticker = selected_record["Symbol"]
+            sel_strike = selected_record["Strike"]
             
-            event = st.dataframe(
-                df.style.format({
-                    "Strike": "${:.2f}",
-                    "Premium": "${:.2f}",
-                    "Cost Basis": "${:.2f}",
-                    "Break Even": "${:.2f}",
-                    "Capital Req": "${:,.0f}",
-                    "Monthly ROI (%)": "{:.2f}%",
-                    "Annualized ROI (%)": "{:.2f}%",
-                    "Delta": "{}" 
-                }),
-                use_container_width=True,
-                selection_mode="single-row",
-                on_select="rerun"
-            )
+            st.markdown("---")
+            st.subheader(f"Detailed View: {sel_ticker}")
             
-            selected_rows = event.selection.rows
-            if selected_rows:
-                selected_index = selected_rows[0]
-                selected_record = df.iloc[selected_index]
-                sel_ticker = selected_record["Symbol"]
-                sel_strike = selected_record["Strike"]
-                
-                st.markdown("---")
-                st.subheader(f"Detailed View: {sel_ticker}")
-                
-                hist_data, err = get_stock_history_with_bollinger(sel_ticker, days=90) # Show 90 days context
-                
-                if err:
-                    st.error(f"Could not load chart: {err}")
-                elif hist_data is not None:
-                     fig = go.Figure()
-
-                     # Candlestick
-                     fig.add_trace(go.Candlestick(x=hist_data.index,
-                                    open=hist_data['Open'],
-                                    high=hist_data['High'],
-                                    low=hist_data['Low'],
-                                    close=hist_data['Close'],
-                                    name='Price'))
-                     
-                     # Bollinger Bands
-                     fig.add_trace(go.Scatter(x=hist_data.index, y=hist_data['Upper_Band'], 
-                                              line=dict(color='gray', width=1), name='Upper Band'))
-                     
-                     fig.add_trace(go.Scatter(x=hist_data.index, y=hist_data['Lower_Band'], 
-                                              line=dict(color='gray', width=1), name='Lower Band',
-                                              fill='tonexty', fillcolor='rgba(128,128,128,0.2)'))
-                     
-                     # Strike Line
-                     fig.add_hline(y=sel_strike, line_dash="dash", line_color="red", annotation_text=f"Strike ${sel_strike}")
-
-                     fig.update_layout(
-                         title=f"{sel_ticker} Price History & Bollinger Bands (Last 90 Days)",
-                         yaxis_title="Stock Price",
-                         xaxis_title="Date",
-                         xaxis_rangeslider_visible=False,
-                         height=600
-                     )
-                     
-                     st.plotly_chart(fig, use_container_width=True)
-                     
-                     st.info(f"The red dashed line shows your potential entry price (Strike: ${sel_strike}) relative to recent price action.")
-
-            st.markdown("### detailed View")
-            st.info("Tip: 'Cost Basis' is your effective entry price if assigned. 'Break Even' is Strike - Premium.")
+            hist_data, err = get_stock_history_with_bollinger(sel_ticker, days=90) # Show 90 days context
             
-        else:
-            st.info("No opportunities found matching your criteria. Try lowering ROI target or increasing capital.")
+            if err:
+                st.error(f"Could not load chart: {err}")
+            elif hist_data is not None:
+                 fig = go.Figure()
+
+                 # Candlestick
+                 fig.add_trace(go.Candlestick(x=hist_data.index,
+                                open=hist_data['Open'],
+                                high=hist_data['High'],
+                                low=hist_data['Low'],
+                                close=hist_data['Close'],
+                                name='Price'))
+                 
+                 # Bollinger Bands
+                 fig.add_trace(go.Scatter(x=hist_data.index, y=hist_data['Upper_Band'], 
+                                          line=dict(color='gray', width=1), name='Upper Band'))
+                 
+                 fig.add_trace(go.Scatter(x=hist_data.index, y=hist_data['Lower_Band'], 
+                                          line=dict(color='gray', width=1), name='Lower Band',
+                                          fill='tonexty', fillcolor='rgba(128,128,128,0.2)'))
+                 
+                 # Strike Line
+                 fig.add_hline(y=sel_strike, line_dash="dash", line_color="red", annotation_text=f"Strike ${sel_strike}")
+
+                 fig.update_layout(
+                     title=f"{sel_ticker} Price History & Bollinger Bands (Last 90 Days)",
+                     yaxis_title="Stock Price",
+                     xaxis_title="Date",
+                     xaxis_rangeslider_visible=False,
+                     height=600
+                 )
+                 
+                 st.plotly_chart(fig, use_container_width=True)
+                 
+                 st.info(f"The red dashed line shows your potential entry price (Strike: ${sel_strike}) relative to recent price action.")
+
+        st.markdown("### detailed View")
+        st.info("Tip: 'Cost Basis' is your effective entry price if assigned. 'Break Even' is Strike - Premium.")
+        
+    else:
+        st.info("No opportunities found matching your criteria. Try lowering ROI target or increasing capital.")